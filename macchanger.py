@@ -1,63 +1,105 @@
 #!/usr/bin/python3
-import argparse
+import errno
 import os
-import random
 import re
+import secrets
 import subprocess
 import sys
 
+SYSFS_NET = "/sys/class/net"
+IFF_UP = 0x1
+RTF_GATEWAY = 0x2
+IFNAMSIZ = 16
+
+# Characters that ip -batch treats as comment, quote or escape markers
+_IP_BATCH_SPECIAL = frozenset("#\"'\\")
+ARPHRD_ETHER = 1
+
+# Regular expression pattern for validating MAC address (with : or -)
+_MAC_RE = re.compile(r"^([0-9A-Fa-f]{2}[:-]){5}([0-9A-Fa-f]{2})$")
+
 
 def get_default_gateway_linux():
     """Get default network interface"""
     try:
-        with open("/proc/net/route") as f:
+        with open("/proc/net/route", "rb") as f:
+            next(f)  # Skip header
             for line in f:
-                fields = line.strip().split()
-                if fields[1] == "00000000" and int(fields[3], 16) & 2:
-                    return fields[0]  # Interface name
+                # Cheap substring test before splitting; the gateway column can
+                # also be zero, so the destination is still checked below
+                if b"\t00000000\t" not in line[:40]:
+                    continue
+                fields = line.split(None, 4)
+                if fields[1] != b"00000000":
+                    continue
+                if int(fields[3], 16) & RTF_GATEWAY:
+                    return fields[0].decode()  # Interface name
     except Exception:
         print("Cannot get default interface on this system, can't read /proc/net/route")
         return None
 
 
+def _read_sysfs(interface: str, attribute: str):
+    """Read a single attribute of a network interface from sysfs"""
+    try:
+        with open(f"{SYSFS_NET}/{interface}/{attribute}") as f:
+            return f.read().strip()
+    except OSError:
+        return None
+
+
+def _valid_interface_name(interface: str) -> bool:
+    """Check interface name against the kernel's dev_valid_name rules"""
+    if interface in ("", ".", "..") or len(os.fsencode(interface)) >= IFNAMSIZ:
+        return False
+    return not any(c == "/" or c == ":" or c.isspace() for c in interface)
+
+
+def _interface_is_up(interface: str) -> bool:
+    """Check the IFF_UP flag of a single interface in sysfs"""
+    flags = _read_sysfs(interface, "flags")
+    return flags is not None and bool(int(flags, 16) & IFF_UP)
+
+
 def get_active_interfaces():
-    """Get only UP/active interfaces"""
+    """Get only UP/active interfaces, sorted by name"""
     try:
-        result = subprocess.check_output(["ip", "link", "show", "up"]).decode()
-        interfaces = []
-
-        for line in result.split("\n"):
-            match = re.match(r"^\d+:\s+(\S+):", line)
-            if match:
-                iface = match.group(1).split("@")[0]
-                if iface != "lo":
-                    interfaces.append(iface)
-
-        return interfaces
-    except subprocess.CalledProcessError:
+        names = sorted(os.listdir(SYSFS_NET))
+    except OSError:
         return []
 
+    interfaces = []
+    for iface in names:
+        if iface == "lo":
+            continue
+        if _interface_is_up(iface):
+            interfaces.append(iface)
+
+    return interfaces
+
 
 def get_mac_with_ip(interface: str):
-    """Get MAC address using ip command"""
-    try:
-        result = subprocess.check_output(["ip", "link", "show", interface]).decode()
-        mac = re.search(r"link/ether\s+([\da-f:]+)", result, re.IGNORECASE)
-        if mac:
-            return mac.group(1)
-    except subprocess.CalledProcessError:
+    """Get Ethernet MAC address of interface from sysfs"""
+    if _read_sysfs(interface, "type") != str(ARPHRD_ETHER):
         return None
+    return _read_sysfs(interface, "address") or None
 
 
 def get_all_mac_addresses_ip():
-    """Get all MAC addresses using ip command"""
+    """Get all Ethernet MAC addresses from sysfs"""
     try:
-        result = subprocess.check_output(["ip", "link", "show"]).decode()
-        mac_list = re.findall(r"link/ether\s+([\da-f:]+)", result, re.IGNORECASE)
-        return mac_list
-    except subprocess.CalledProcessError:
+        names = os.listdir(SYSFS_NET)
+    except OSError:
         return []
 
+    mac_list = []
+    for iface in names:
+        mac = _read_sysfs(iface, "address")
+        if mac and _read_sysfs(iface, "type") == str(ARPHRD_ETHER):
+            mac_list.append(mac)
+
+    return mac_list
+
 
 def validate_mac_address(mac: str) -> bool:
     """
@@ -69,9 +111,7 @@ def validate_mac_address(mac: str) -> bool:
     Returns:
         True if valid, False otherwise
     """
-    # Regular expression pattern for validating MAC address (with : or -)
-    mac_pattern = r"^([0-9A-Fa-f]{2}[:-]){5}([0-9A-Fa-f]{2})$"
-    return bool(re.match(mac_pattern, mac))
+    return bool(_MAC_RE.match(mac))
 
 
 def generate_random_mac() -> str:
@@ -82,16 +122,101 @@ def generate_random_mac() -> str:
         Random MAC address in format XX:XX:XX:XX:XX:XX
     """
     # Start with 00 to ensure it's a locally administered address
-    mac = [
-        0x00,
-        0x16,
-        0x3E,
-        random.randint(0x00, 0x7F),
-        random.randint(0x00, 0xFF),
-        random.randint(0x00, 0xFF),
+    rand = secrets.token_bytes(3)
+    mac = [0x00, 0x16, 0x3E, rand[0] & 0x7F, rand[1], rand[2]]
+
+    return bytes(mac).hex(":")
+
+
+def _set_mac_netlink(interface: str, new_mac_address: str):
+    """Set MAC address over a single netlink socket using pyroute2
+
+    Returns:
+        MAC address reported by the kernel on the same socket afterwards
+    """
+    from pyroute2 import IPRoute
+    from pyroute2.netlink.exceptions import NetlinkError
+
+    try:
+        with IPRoute() as ipr:
+            indices = ipr.link_lookup(ifname=interface)
+            if not indices:
+                raise OSError(errno.ENODEV, f'Cannot find device "{interface}"')
+            idx = indices[0]
+
+            print("[*] Bringing interface down...")
+            ipr.link("set", index=idx, state="down")
+
+            print(f"[*] Changing MAC address to {new_mac_address}...")
+            ipr.link("set", index=idx, address=new_mac_address)
+
+            print("[*] Bringing interface up...")
+            ipr.link("set", index=idx, state="up")
+
+            return ipr.get_links(idx)[0].get_attr("IFLA_ADDRESS")
+    except NetlinkError as e:
+        raise OSError(e.code, os.strerror(e.code)) from e
+
+
+def _set_mac_ip(interface: str, new_mac_address: str):
+    """Set MAC address using a single ip command in batch mode
+
+    Interface names containing ip -batch syntax characters are passed as
+    arguments to separate ip link set calls instead.
+
+    Returns:
+        MAC address read back from sysfs afterwards
+    """
+    steps = [
+        ("[*] Bringing interface down...", ["down"]),
+        (
+            f"[*] Changing MAC address to {new_mac_address}...",
+            ["address", new_mac_address],
+        ),
+        ("[*] Bringing interface up...", ["up"]),
     ]
 
-    return ":".join(map(lambda x: "%02x" % x, mac))
+    if _IP_BATCH_SPECIAL.intersection(interface):
+        # The name cannot be written into a batch script verbatim, pass it as argv
+        for message, args in steps:
+            print(message)
+            subprocess.run(
+                ["ip", "link", "set", interface, *args],
+                check=True,
+                stdout=subprocess.DEVNULL,
+                stderr=subprocess.PIPE,
+            )
+        return get_mac_with_ip(interface)
+
+    # All steps run in one ip process; on failure ip names the failing line
+    commands = ""
+    for message, args in steps:
+        print(message)
+        commands += f"link set {interface} {' '.join(args)}\n"
+    subprocess.run(
+        ["ip", "-batch", "-"],
+        input=commands.encode(),
+        check=True,
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.PIPE,
+    )
+
+    return get_mac_with_ip(interface)
+
+
+def _set_mac(interface: str, new_mac_address: str):
+    """
+    Set MAC address with pyroute2 if installed, otherwise with the ip command
+
+    Returns:
+        MAC address of the interface after the change
+    """
+    try:
+        import pyroute2  # noqa: F401
+    except ImportError:  # pyroute2 is optional, fall back to the ip utility
+        return _set_mac_ip(interface, new_mac_address)
+
+    return _set_mac_netlink(interface, new_mac_address)
 
 
 def change_mac_address(
@@ -113,12 +238,15 @@ def change_mac_address(
             print("[-] Error: Could not automatically determine default interface.")
             return False
     elif isinstance(interface, str):
-        system_interfaces = get_active_interfaces()
-        if interface not in system_interfaces:
+        if (
+            interface == "lo"
+            or not _valid_interface_name(interface)
+            or not _interface_is_up(interface)
+        ):
             print(
                 f"[-] Error: Interface '{interface}' not found in system or not active!"
             )
-            print(f"[*] Available interfaces: {', '.join(system_interfaces)}")
+            print(f"[*] Available interfaces: {', '.join(get_active_interfaces())}")
             return False
     else:
         print(
@@ -167,24 +295,8 @@ def change_mac_address(
     print("=" * 50 + "\n")
 
     try:
-        print("[*] Bringing interface down...")
-        subprocess.run(
-            ["ip", "link", "set", interface, "down"], check=True, capture_output=True
-        )
+        verify_mac = _set_mac(interface, new_mac_address)
 
-        print(f"[*] Changing MAC address to {new_mac_address}...")
-        subprocess.run(
-            ["ip", "link", "set", interface, "address", new_mac_address],
-            check=True,
-            capture_output=True,
-        )
-
-        print("[*] Bringing interface up...")
-        subprocess.run(
-            ["ip", "link", "set", interface, "up"], check=True, capture_output=True
-        )
-
-        verify_mac = get_mac_with_ip(interface)
         if verify_mac and verify_mac.lower() == new_mac_address.lower():
             print("\n[OK] SUCCESS: MAC address changed successfully!")
             print(f"[OK] Verified MAC address: {verify_mac}")
@@ -200,6 +312,10 @@ def change_mac_address(
         if e.stderr:
             print(f"[-] Details: {e.stderr.decode().strip()}")
         return False
+    except OSError as e:
+        print("\n[-] ERROR: Failed to change MAC address")
+        print(f"[-] Details: {e}")
+        return False
     except Exception as e:
         print(f"\n[-] ERROR: Unexpected error occurred: {e}")
         return False
@@ -217,6 +333,8 @@ def main():
         print("=" * 60)
         sys.exit(1)
 
+    import argparse
+
     parser = argparse.ArgumentParser(
         prog="MacChanger",
         description="Simple utility to change MAC address on Linux systems",